@@ -8,6 +8,7 @@ Usage:
 """
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 root = Path(__file__).resolve().parent
@@ -19,12 +20,44 @@ elif len(sys.argv) == 2:
     (root / "VERSION").write_text(new + "\n")
 else:
     sys.exit("Usage: python bump-version.py [NEW_VERSION]")
-for rel in ("Cargo.toml", "python/Cargo.toml", "python/pyproject.toml"):
-    p = root / rel
-    p.write_text(
-        re.sub(r'^(version\s*=\s*")[^"]+(")', rf'\g<1>{new}\g<2>',
-               p.read_text(), count=1, flags=re.MULTILINE)
-    )
+# Compiled once, shared by every file in the loop.
+version_line = re.compile(r'^(version\s*=\s*")[^"]+(")', re.MULTILINE)
+replacement = rf'\g<1>{new}\g<2>'
+
+lock = root / "python/uv.lock"
+
+
+def read_lock():
+    # newline="" on both ends so the file's existing line endings survive the
+    # round-trip untouched (this one is long enough that a wholesale CRLF/LF
+    # flip would bury the one-line change).
+    with open(lock, encoding="utf-8", newline="") as f:
+        return f.read()
+
+
+targets = [root / rel for rel in ("Cargo.toml", "python/Cargo.toml", "python/pyproject.toml")]
+
+# The reads are independent, so overlap them — including uv.lock, the largest —
+# in a small pool: free on a warm page cache, and on a cold or networked
+# filesystem the wall time is the slowest read rather than the sum.
+with ThreadPoolExecutor(max_workers=len(targets) + 1) as ex:
+    lock_read = ex.submit(read_lock)
+    writes = []
+    for p, content in zip(targets, ex.map(Path.read_text, targets)):
+        # Common case (re-sync, CI): already at the target version. Skip only
+        # when the regex's own first match — the exact line sub() would
+        # rewrite — is already current. A dependency pinned at the same
+        # number (inline or in its own [dependencies.*] table) sits after the
+        # package's version line, so it can never satisfy this.
+        m = version_line.search(content)
+        if m and m.group() == f'version = "{new}"':
+            continue
+        new_content = version_line.sub(replacement, content, count=1)
+        if new_content != content:
+            writes.append(ex.submit(p.write_text, new_content))
+    for write in writes:
+        write.result()
+    lock_text = lock_read.result()
 
 
 def bump_lock(text, version, package="kalix"):
@@ -62,14 +95,9 @@ def bump_lock(text, version, package="kalix"):
     raise ValueError(f"[[package]] block named {package!r} has no version line")
 
 
-# newline="" on both ends so the file's existing line endings survive the
-# round-trip untouched (this one is long enough that a wholesale CRLF/LF
-# flip would bury the one-line change).
-lock = root / "python/uv.lock"
-with open(lock, encoding="utf-8", newline="") as f:
-    lock_text = f.read()
-lock_text = bump_lock(lock_text, new)
-with open(lock, "w", encoding="utf-8", newline="") as f:
-    f.write(lock_text)
+new_lock_text = bump_lock(lock_text, new)
+if new_lock_text != lock_text:
+    with open(lock, "w", encoding="utf-8", newline="") as f:
+        f.write(new_lock_text)
 
 print(f"Bumped to {new}")
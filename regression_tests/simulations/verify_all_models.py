@@ -3,6 +3,8 @@
 Automatically finds and verifies all Kalix model INI files against their mass balance reports.
 """
 
+import argparse
+import concurrent.futures
 import difflib
 import os
 import re
@@ -10,6 +12,8 @@ import shutil
 import subprocess
 import sys
 import tempfile
+import threading
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 
@@ -25,15 +29,56 @@ import numpy as np
 # verify in its own right.
 _RESAVE_CHECK_SUFFIX = '.resave_check.ini'
 
+# Directories that never hold models; pruning them skips whole readdir
+# subtrees (a Cargo target/ alone runs to tens of thousands of entries when
+# the walk is pointed at the repo root).
+_SKIP_DIRS = {'.git', 'target', '__pycache__', 'node_modules', '.venv', 'venv', 'build'}
 
-def find_model_files(root_dir):
-    """Find all .ini files in the directory tree, excluding debug artifacts."""
-    ini_files = []
-    for root, dirs, files in os.walk(root_dir):
-        for file in files:
-            if file.endswith('.ini') and not file.endswith(_RESAVE_CHECK_SUFFIX):
-                ini_files.append(os.path.join(root, file))
-    return sorted(ini_files)
+
+def find_model_files(root_dir, mbal_filename='mbal.txt'):
+    """Find all models in the directory tree, paired with their mass balance file.
+
+    Walks with os.scandir rather than os.walk: DirEntry.is_dir/is_file answer
+    from the directory listing itself, so classifying an entry costs no extra
+    stat() per entry — which adds up over large trees, especially on network
+    filesystems. Unreadable directories are skipped rather than fatal.
+
+    The reference mass balance file is spotted in the same scandir pass, so
+    the checks never need an exists()/stat() of their own per model. The
+    root-relative path used for reporting is computed here too, once, rather
+    than re-derived downstream.
+
+    Returns:
+        list of (ini_path, rel_path, mbal_path) tuples, sorted by ini_path;
+        mbal_path is None when the model's directory has no `mbal_filename`.
+    """
+    model_files = []
+    stack = [root_dir]
+    while stack:
+        directory = stack.pop()
+        dir_inis = []
+        mbal_path = None
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in _SKIP_DIRS:
+                            stack.append(entry.path)
+                    elif entry.name == mbal_filename:
+                        mbal_path = entry.path
+                    elif (entry.name.endswith('.ini')
+                            and not entry.name.endswith(_RESAVE_CHECK_SUFFIX)
+                            and entry.is_file(follow_symlinks=False)):
+                        dir_inis.append(entry.path)
+        except OSError:
+            continue
+        model_files.extend(
+            (ini_path, os.path.relpath(ini_path, root_dir), mbal_path)
+            for ini_path in dir_inis
+        )
+    # In-place: sorted() would copy the whole list just to throw one away.
+    model_files.sort()
+    return model_files
 
 
 def get_numerical_content(line: str):
@@ -144,16 +189,125 @@ def resolve_backend(explicit=None):
     return 'package', None
 
 
+# Persistent `kalix simulate-batch` workers, one per verifying thread. Spawning
+# a fresh CLI process per model pays fork+exec+runtime-init once per model;
+# a long-lived batch worker pays it once per thread for the whole run.
+_batch_local = threading.local()
+_batch_workers = []
+_batch_workers_lock = threading.Lock()
+
+
+def _batch_worker(cli_bin):
+    """Return this thread's live batch worker, spawning one if needed.
+
+    stderr goes to an unlinked temp file rather than a pipe: nobody drains the
+    pipe while the worker lives, so engine warnings could fill it and deadlock;
+    the file never blocks and is read back into the error if the worker dies.
+    Popen keeps no handle to a caller-supplied stderr file, so it is stashed
+    on the Popen object for the death path to find.
+    """
+    proc = getattr(_batch_local, 'proc', None)
+    if proc is None or proc.poll() is not None:
+        stderr_file = tempfile.TemporaryFile()
+        proc = subprocess.Popen(
+            [str(cli_bin), 'simulate-batch'],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=stderr_file, text=True,
+        )
+        proc.stderr_file = stderr_file
+        _batch_local.proc = proc
+        with _batch_workers_lock:
+            _batch_workers.append(proc)
+    return proc
+
+
+def _worker_stderr(proc):
+    """Read back what a dead worker wrote to its stderr temp file."""
+    try:
+        proc.stderr_file.seek(0)
+        return proc.stderr_file.read().decode(errors='replace').strip()
+    except (OSError, ValueError):
+        return ''
+
+
+def _retire_batch_worker(proc):
+    """Kill a worker that died or desynced; the next call spawns a fresh one."""
+    _batch_local.proc = None
+    proc.kill()
+    proc.stderr_file.close()
+    with _batch_workers_lock:
+        if proc in _batch_workers:
+            _batch_workers.remove(proc)
+
+
+def shutdown_batch_workers():
+    """End every batch worker's stdin loop (EOF) and reap it."""
+    with _batch_workers_lock:
+        workers = _batch_workers[:]
+        _batch_workers.clear()
+    for proc in workers:
+        try:
+            proc.stdin.close()
+        except OSError:
+            pass
+    for proc in workers:
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+        proc.stderr_file.close()
+
+
+def _batch_simulate(cli_bin, model_path, mass_balance_path):
+    """Run one simulation through this thread's persistent batch worker.
+
+    One tab-separated request line goes in; the worker answers with exactly one
+    `OK <model>` / `FAIL <model> <reason>` line (any stray engine chatter on
+    stdout is skipped). A watchdog kills the worker if no verdict arrives in
+    300s, standing in for the per-call subprocess timeout.
+    """
+    proc = _batch_worker(cli_bin)
+    failure = None
+    broken = True
+    try:
+        proc.stdin.write(f"{model_path}\t{mass_balance_path}\n")
+        proc.stdin.flush()
+        watchdog = threading.Timer(300, proc.kill)
+        watchdog.start()
+        try:
+            while True:
+                line = proc.stdout.readline()
+                if not line:
+                    break  # EOF: the worker died (crash or watchdog kill)
+                if line.startswith('OK '):
+                    broken = False
+                    return
+                if line.startswith('FAIL '):
+                    parts = line.rstrip('\n').split(' ', 2)
+                    failure = parts[2] if len(parts) > 2 else 'simulation failed'
+                    broken = False
+                    raise RuntimeError(failure)
+        finally:
+            watchdog.cancel()
+        # The one failure FAIL lines can't report: the worker itself is gone
+        # (engine panic, or the watchdog killed it). Its stderr carries the
+        # only detail there is.
+        detail = _worker_stderr(proc)
+        raise RuntimeError("kalix batch worker died (crashed or timed out)"
+                           + (f": {detail}" if detail else ""))
+    except OSError as e:
+        detail = _worker_stderr(proc)
+        raise RuntimeError(f"kalix batch worker unreachable: {e}"
+                           + (f": {detail}" if detail else ""))
+    finally:
+        if broken:
+            _retire_batch_worker(proc)
+
+
 def _simulate(backend, cli_bin, model_path, mass_balance_path):
     """Run a simulation via the chosen backend, writing the mass balance file."""
     if backend == 'cli':
-        result = subprocess.run(
-            [str(cli_bin), 'simulate', model_path, '-m', mass_balance_path],
-            capture_output=True, text=True,
-        )
-        if result.returncode != 0:
-            detail = (result.stderr or result.stdout or '').strip()
-            raise RuntimeError(detail or f"kalix exited with code {result.returncode}")
+        _batch_simulate(cli_bin, model_path, mass_balance_path)
     else:
         import kalix
         kalix.simulate(model_path, mass_balance=mass_balance_path)
@@ -168,10 +322,23 @@ def _resave(cli_bin, model_path, resaved_path, save_method=None):
     cmd = [str(cli_bin), 'resave', model_path, resaved_path]
     if save_method is not None:
         cmd += ['--save-method', save_method]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode != 0:
-        detail = (result.stderr or result.stdout or '').strip()
-        raise RuntimeError(f"resave failed: {detail or f'kalix exited with code {result.returncode}'}")
+    # Stream stdout as bytes, keeping only a short tail: the text matters only
+    # if the resave fails, so the common case never decodes (or holds) the
+    # whole output. The watchdog stands in for a subprocess.run timeout.
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    tail = deque(maxlen=10)
+    watchdog = threading.Timer(300, proc.kill)
+    watchdog.start()
+    try:
+        for line in proc.stdout:
+            tail.append(line)
+        err = proc.stderr.read()
+        returncode = proc.wait()
+    finally:
+        watchdog.cancel()
+    if returncode != 0:
+        detail = (err or b''.join(tail)).decode(errors='replace').strip()
+        raise RuntimeError(f"resave failed: {detail or f'kalix exited with code {returncode}'}")
 
 
 def _with_final_newline(text):
@@ -217,8 +384,10 @@ def verify_resave_noop(model_path, backend, cli_bin):
     if backend != 'cli':
         return True, "SKIPPED (resave needs the CLI backend)"
 
-    model_dir = os.path.dirname(model_path)
-    stem = Path(model_path).stem
+    # One split gives both halves; deriving the stem from the bare filename
+    # avoids re-scanning the directory part.
+    model_dir, model_name = os.path.split(model_path)
+    stem = Path(model_name).stem
     resaved_path = os.path.join(model_dir, f"{stem}.noop" + _RESAVE_CHECK_SUFFIX)
     ini_diff_path = os.path.join(model_dir, f"{stem}.noop.resave_check.diff")
     success = False
@@ -252,7 +421,7 @@ def verify_resave_noop(model_path, backend, cli_bin):
                 os.unlink(ini_diff_path)
 
 
-def verify_resave_canonical(model_path, backend, cli_bin, mbal_filename='mbal.txt'):
+def verify_resave_canonical(model_path, backend, cli_bin, mbal_path):
     """
     Verify that a model still simulates identically after a canonical save.
 
@@ -272,7 +441,8 @@ def verify_resave_canonical(model_path, backend, cli_bin, mbal_filename='mbal.tx
         model_path: Path to the .ini model file
         backend: 'cli' or 'package' (see resolve_backend)
         cli_bin: Path to the CLI binary when backend == 'cli', else None
-        mbal_filename: Name of the reference mass balance file to verify against
+        mbal_path: Path to the reference mass balance file, or None when the
+            model's directory has none (as reported by find_model_files)
 
     On failure, the resaved model, an ini diff against the source, and (if the
     mismatch was in the mass balance) the generated mass balance are left on
@@ -287,14 +457,15 @@ def verify_resave_canonical(model_path, backend, cli_bin, mbal_filename='mbal.tx
     if backend != 'cli':
         return True, "SKIPPED (resave round-trip needs the CLI backend)"
 
-    model_dir = os.path.dirname(model_path)
-    mbal_path = os.path.join(model_dir, mbal_filename)
-    if not os.path.exists(mbal_path):
-        return False, f"Mass balance file not found: {mbal_path}"
+    # The walk already looked: no stat needed here.
+    if mbal_path is None:
+        return False, "Mass balance file not found beside the model"
 
     # Resave alongside the original (not a system temp dir) so the model's
-    # relative input-file paths still resolve when we re-simulate it.
-    stem = Path(model_path).stem
+    # relative input-file paths still resolve when we re-simulate it. One
+    # split gives both halves; the stem comes from the bare filename.
+    model_dir, model_name = os.path.split(model_path)
+    stem = Path(model_name).stem
     resaved_path = os.path.join(model_dir, f"{stem}.canonical" + _RESAVE_CHECK_SUFFIX)
     ini_diff_path = os.path.join(model_dir, f"{stem}.canonical.resave_check.diff")
     tmp_mbal_path = None
@@ -348,7 +519,7 @@ def verify_resave_canonical(model_path, backend, cli_bin, mbal_filename='mbal.tx
             os.unlink(tmp_mbal_path)
 
 
-def verify_model(model_path, backend, cli_bin, mbal_filename='mbal.txt'):
+def verify_model(model_path, backend, cli_bin, mbal_path):
     """
     Verify a model against its mass balance report via the selected backend.
 
@@ -356,17 +527,15 @@ def verify_model(model_path, backend, cli_bin, mbal_filename='mbal.txt'):
         model_path: Path to the .ini model file
         backend: 'cli' or 'package' (see resolve_backend)
         cli_bin: Path to the CLI binary when backend == 'cli', else None
-        mbal_filename: Name of the mass balance file to verify against
+        mbal_path: Path to the reference mass balance file, or None when the
+            model's directory has none (as reported by find_model_files)
 
     Returns:
         tuple: (success: bool, message: str)
     """
-    model_dir = os.path.dirname(model_path)
-    mbal_path = os.path.join(model_dir, mbal_filename)
-
-    # Check if reference mass balance file exists
-    if not os.path.exists(mbal_path):
-        return False, f"Mass balance file not found: {mbal_path}"
+    # The walk already looked: no stat needed here.
+    if mbal_path is None:
+        return False, "Mass balance file not found beside the model"
 
     try:
         # Create a temporary file for the new mass balance
@@ -437,46 +606,66 @@ def _run_tests():
 
 
 def main():
-    argv = sys.argv[1:]
-
-    if '--test' in argv:
+    parser = argparse.ArgumentParser(
+        description="Find and verify every Kalix model under a directory.")
+    parser.add_argument('root_dir', nargs='?', default=None,
+                        help="directory to search for models "
+                             "(default: this script's directory)")
+    parser.add_argument('--backend', choices=('cli', 'package', 'auto'),
+                        default='auto',
+                        help="simulation backend (default: auto-detect, "
+                             "preferring a locally-built CLI)")
+    parser.add_argument('--jobs', type=int, metavar='N', default=None,
+                        help="cap on parallel verifications (default: CPU count)")
+    parser.add_argument('--fail-fast', action='store_true',
+                        help="stop after the first model that fails a check")
+    parser.add_argument('--test', action='store_true',
+                        help="run this script's self-tests and exit")
+    args = parser.parse_args()
+
+    if args.test:
         _run_tests()
         sys.exit(0)
 
-    # Optional --backend cli|package|auto override (default: auto-detect).
-    backend_choice = None
-    if '--backend' in argv:
-        i = argv.index('--backend')
-        try:
-            value = argv[i + 1]
-        except IndexError:
-            sys.exit("--backend requires a value: cli, package, or auto")
-        if value not in ('cli', 'package', 'auto'):
-            sys.exit(f"Invalid --backend '{value}': choose cli, package, or auto")
-        backend_choice = None if value == 'auto' else value
-        del argv[i:i + 2]
+    jobs = args.jobs
+    if jobs is not None and jobs < 1:
+        parser.error("--jobs must be at least 1")
 
-    backend, cli_bin = resolve_backend(backend_choice)
+    backend, cli_bin = resolve_backend(
+        None if args.backend == 'auto' else args.backend)
 
     # Get the script's directory as the root search directory
     script_dir = os.path.dirname(os.path.abspath(__file__))
     log_file = os.path.join(script_dir, 'verify_all_models_log.txt')
 
-    # Delete log file if it exists - a failed run should leave no file
+    # Delete log file if it exists - a crashed run should leave no final file
     if os.path.exists(log_file):
         os.remove(log_file)
 
-    # Collect output lines to write to log file at the end
-    output_lines = []
+    # Stream the log to a .partial file as we go (line-buffered) instead of
+    # holding every line in memory until the end: memory stays constant no
+    # matter how many models run, and if the run crashes the partial log is
+    # still on disk for diagnosis. It is promoted to the real name on
+    # completion (below), preserving the no-final-file-on-crash semantics.
+    partial_log_file = log_file + '.partial'
+    log_fh = open(partial_log_file, 'w', buffering=1)
 
-    def log(message=''):
-        """Print to screen and collect for log file."""
-        print(message)
-        output_lines.append(message)
+    # Bound once: every log line goes through a plain stdout.write, skipping
+    # print()'s per-call sep/end handling. log() is only ever called from the
+    # main thread (workers buffer their lines), so no lock is needed.
+    _write = sys.stdout.write
 
-    # Allow optional command line argument for different root directory
-    if argv:
-        root_dir = argv[0]
+    def log(message=''):
+        """Write to screen and stream to the log file."""
+        line = message + '\n'
+        _write(line)
+        log_fh.write(line)
+
+    # Allow optional command line argument for different root directory.
+    # Normalised to absolute so every path threaded out of the walk (and the
+    # artifact paths derived from them) is absolute too.
+    if args.root_dir:
+        root_dir = os.path.abspath(args.root_dir)
     else:
         root_dir = script_dir
 
@@ -501,22 +690,57 @@ def main():
     # save paths, driven from the CLI so no model file has to declare a save
     # method for the sake of the harness.
     checks = [
-        (None, lambda p: verify_model(p, backend, cli_bin)),
-        ('no-op save', lambda p: verify_resave_noop(p, backend, cli_bin)),
-        ('canonical resave', lambda p: verify_resave_canonical(p, backend, cli_bin)),
+        (None, lambda p, mbal: verify_model(p, backend, cli_bin, mbal)),
+        ('no-op save', lambda p, mbal: verify_resave_noop(p, backend, cli_bin)),
+        ('canonical resave', lambda p, mbal: verify_resave_canonical(p, backend, cli_bin, mbal)),
     ]
 
-    results = []
-    for model_path in model_files:
-        rel_path = os.path.relpath(model_path, root_dir)
-        log(f"Verifying: {rel_path}")
+    def verify_one(model_path, rel_path, mbal_path):
+        """Run every check for one model, returning its buffered log lines.
 
+        Workers never print: lines are buffered per model and flushed from the
+        main thread, so each model's output stays one contiguous block even
+        though models finish out of order.
+        """
+        lines = [f"Verifying: {rel_path}"]
+        model_results = []
         for label, run in checks:
-            success, message = run(model_path)
+            success, message = run(model_path, mbal_path)
             result_key = rel_path if label is None else f"{rel_path} ({label})"
-            results.append((result_key, success, message))
-            log(f"  [{'PASS' if success else 'FAIL'}] {message}")
-        log()
+            model_results.append((result_key, success, message))
+            lines.append(f"  [{'PASS' if success else 'FAIL'}] {message}")
+        lines.append('')
+        return lines, model_results
+
+    # Each verification is an independent child process (or, on the package
+    # backend, a blocking native call), so threads are enough to fan out —
+    # the GIL is released for the hot work either way.
+    max_workers = min(len(model_files), jobs or os.cpu_count() or 1)
+    results = []
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as ex:
+            futures = [ex.submit(verify_one, p, rel, mbal)
+                       for p, rel, mbal in model_files]
+            # Drain in submission order, not completion order: workers still
+            # run ahead in parallel, but the log keeps the sequential run's
+            # deterministic model order — the tracked log file (and the
+            # website tooling that reads it) would otherwise reshuffle on
+            # every refresh.
+            for future in futures:
+                lines, model_results = future.result()
+                for line in lines:
+                    log(line)
+                results.extend(model_results)
+                if args.fail_fast and any(not ok for _, ok, _ in model_results):
+                    # Drop the queued models; models already running finish
+                    # (their child processes can't be snatched back) but are
+                    # no longer reported.
+                    ex.shutdown(wait=False, cancel_futures=True)
+                    log("Stopping early (--fail-fast): a check failed.")
+                    log()
+                    break
+    finally:
+        shutdown_batch_workers()
 
     # Summary
     log("=" * 80)
@@ -540,9 +764,9 @@ def main():
     else:
         log("\n[PASS] All models verified successfully!")
 
-    # Write log file at the end (only if we got this far)
-    with open(log_file, 'w') as f:
-        f.write('\n'.join(output_lines) + '\n')
+    # The run completed (pass or fail): promote the streamed log atomically.
+    log_fh.close()
+    os.replace(partial_log_file, log_file)
 
     sys.exit(1 if failed > 0 else 0)
 
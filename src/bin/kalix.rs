@@ -54,6 +54,15 @@ enum Commands {
         #[arg(short = 'p', long)]
         profile: bool,
     },
+    /// Run many simulations in one process, driven over stdin.
+    ///
+    /// Reads tab-separated `MODEL_FILE<TAB>MASS_BALANCE_FILE` lines from stdin
+    /// and, for each, loads and runs the model and writes its mass balance
+    /// report to the given path, answering `OK <model>` or `FAIL <model>
+    /// <reason>` on stdout. Ends cleanly at EOF. Exists so a driver verifying a
+    /// whole regression suite pays process startup once instead of once per
+    /// model.
+    SimulateBatch {},
     /// Run parameter optimisation
     #[command(visible_alias = "opt", alias = "optimize")]
     Optimise {
@@ -110,6 +119,18 @@ enum SaveMethodArg {
     Canonical,
 }
 
+/// Load, configure, and run one model, writing its mass balance report.
+///
+/// The batch loop's unit of work: any failure comes back as a message rather
+/// than an exit, so one bad model never takes down the rest of the batch.
+fn run_batch_simulation(model_file: &str, mass_balance_file: &str) -> Result<(), String> {
+    let mut m = IniModelIO::read_model_file(model_file).map_err(|e| e.to_string())?;
+    m.configure()?;
+    m.run()?;
+    let mb_report = m.generate_mass_balance_report();
+    fs::write(mass_balance_file, mb_report).map_err(|e| e.to_string())
+}
+
 impl From<SaveMethodArg> for SaveMethod {
     fn from(arg: SaveMethodArg) -> Self {
         match arg {
@@ -168,6 +189,39 @@ fn main() {
                 }
             }
         }
+        Commands::SimulateBatch {} => {
+            // One result line per request, flushed immediately, reasons folded
+            // onto one line — the driver at the far end parses line-by-line.
+            let stdin = io::stdin();
+            let mut line = String::new();
+            loop {
+                line.clear();
+                match stdin.read_line(&mut line) {
+                    Ok(0) | Err(_) => break, // EOF: the driver is done with us
+                    Ok(_) => {}
+                }
+                let request = line.trim();
+                if request.is_empty() {
+                    continue;
+                }
+                let result = match request.split_once('\t') {
+                    Some((model_file, mass_balance_file)) => {
+                        run_batch_simulation(model_file, mass_balance_file)
+                            .map(|_| model_file.to_string())
+                            .map_err(|e| (model_file.to_string(), e))
+                    }
+                    None => Err((request.to_string(),
+                        "expected MODEL_FILE<TAB>MASS_BALANCE_FILE".to_string())),
+                };
+                match result {
+                    Ok(model_file) => println!("OK {}", model_file),
+                    Err((model_file, reason)) => {
+                        println!("FAIL {} {}", model_file, reason.replace('\n', " "))
+                    }
+                }
+                io::stdout().flush().unwrap();
+            }
+        }
         Commands::Simulate { model_file, output_file,
             mass_balance, verify_mass_balance, profile } => {
 